@@ -5,30 +5,97 @@ with a structured template fallback if LLM is unavailable.
 """
 
 import os
+import sys
+import time
+import string
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+
+try:
+    import google.generativeai as genai
+except ImportError:  # LLM explanations are optional
+    genai = None
 
 logger = logging.getLogger("PharmaGuard.ExplanationEngine")
 
 # ---------------------------------------------------------------------------
 # LLM setup — Google Gemini
 # ---------------------------------------------------------------------------
+# Using gemini-2.0-flash-lite-001 which may have better availability
+GEMINI_MODEL_NAME = "gemini-2.0-flash-lite-001"
+
+# Explanations run well under 250 tokens; a tight cap bounds decode time and
+# a low temperature keeps answers near-deterministic (and cacheable).
+GEMINI_GENERATION_CONFIG = {
+    "max_output_tokens": 300,
+    "temperature": 0.1,
+    "top_p": 0.9,
+    "candidate_count": 1,
+}
+
 _gemini_configured = False
+_gemini_model = None  # genai.GenerativeModel, created once by _configure_gemini
+
+# Upper bound on concurrent Gemini requests (keeps batches under the QPM tier)
+MAX_CONCURRENT_LLM = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8"))
+# How long a request may queue for a slot before using the fallback template
+LLM_SLOT_TIMEOUT_S = float(os.environ.get("GEMINI_SLOT_TIMEOUT", "4.0"))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+_llm_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Return the Gemini concurrency semaphore bound to the running event loop."""
+    global _llm_semaphore, _llm_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _llm_semaphore is None or _llm_semaphore_loop is not loop:
+        _llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM)
+        _llm_semaphore_loop = loop
+    return _llm_semaphore
+
+
+async def _acquire_llm_slot() -> Optional[asyncio.Semaphore]:
+    """
+    Wait up to LLM_SLOT_TIMEOUT_S for a concurrency slot and return the
+    acquired semaphore, or None if none freed up. Queueing behind our own
+    limit says nothing about Gemini's health, so it never trips the breaker.
+    """
+    semaphore = _get_llm_semaphore()
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=LLM_SLOT_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"No Gemini slot free after {LLM_SLOT_TIMEOUT_S}s — using fallback explanation."
+        )
+        return None
+    return semaphore
+
 
 def _configure_gemini():
-    """Lazy-initialise Gemini client (only once)."""
-    global _gemini_configured
+    """Lazy-initialise Gemini client and model (only once)."""
+    global _gemini_configured, _gemini_model
     if _gemini_configured:
         return True
 
+    if genai is None:
+        logger.warning("google-generativeai not installed — LLM explanations disabled, using fallback.")
+        return False
+
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         logger.warning("GEMINI_API_KEY not set — LLM explanations disabled, using fallback.")
         return False
 
     try:
-        import google.generativeai as genai
         genai.configure(api_key=api_key)
+        _gemini_model = genai.GenerativeModel(
+            GEMINI_MODEL_NAME,
+            generation_config=genai.types.GenerationConfig(**GEMINI_GENERATION_CONFIG),
+        )
         _gemini_configured = True
         logger.info("Google Gemini client configured successfully.")
         return True
@@ -54,44 +121,290 @@ Risk: {risk_label}
 Detected variants: {variant_list}"""
 
 
+# Template pre-parsed once into (literal_text, field_name) pairs
+_PROMPT_PARTS = [
+    (literal, field_name)
+    for literal, field_name, _, _ in string.Formatter().parse(CLINICAL_PROMPT)
+]
+
+# Canonical spellings so equivalent inputs render to the same prompt
+_PHENOTYPE_ALIASES = {
+    "pm":  "Poor Metabolizer",
+    "im":  "Intermediate Metabolizer",
+    "nm":  "Normal Metabolizer",
+    "rm":  "Rapid Metabolizer",
+    "um":  "Ultrarapid Metabolizer",
+    "urm": "Ultrarapid Metabolizer",
+    "poor metabolizer":         "Poor Metabolizer",
+    "intermediate metabolizer": "Intermediate Metabolizer",
+    "normal metabolizer":       "Normal Metabolizer",
+    "rapid metabolizer":        "Rapid Metabolizer",
+    "ultrarapid metabolizer":   "Ultrarapid Metabolizer",
+    "indeterminate":            "Indeterminate",
+}
+
+_RISK_LABEL_ALIASES = {
+    "safe":          "Safe",
+    "adjust dosage": "Adjust Dosage",
+    "toxic":         "Toxic",
+    "ineffective":   "Ineffective",
+    "unknown":       "Unknown",
+}
+
+
 def _build_prompt(gene: str, diplotype: str, phenotype: str,
                   drug: str, risk_label: str, variant_list: List[str]) -> str:
-    """Fill the clinical prompt template with provided values."""
-    variants_str = ", ".join(variant_list) if variant_list else "None detected"
-    return CLINICAL_PROMPT.format(
-        gene=gene,
-        diplotype=diplotype,
-        phenotype=phenotype,
-        drug=drug,
-        risk_label=risk_label,
-        variant_list=variants_str,
+    """Fill the clinical prompt template with canonicalised values."""
+    drug       = drug.strip().lower()
+    phenotype  = _PHENOTYPE_ALIASES.get(phenotype.strip().lower(), phenotype)
+    risk_label = _RISK_LABEL_ALIASES.get(risk_label.strip().lower(), risk_label)
+    variants_str = (
+        ", ".join(sorted(v.strip() for v in variant_list))
+        if variant_list else "None detected"
     )
+    values = {
+        "gene": gene,
+        "diplotype": diplotype,
+        "phenotype": phenotype,
+        "drug": drug,
+        "risk_label": risk_label,
+        "variant_list": variants_str,
+    }
+    out: List[str] = []
+    for literal, field_name in _PROMPT_PARTS:
+        out.append(literal)
+        if field_name:
+            out.append(str(values[field_name]))
+    return "".join(out)
+
+
+# ---------------------------------------------------------------------------
+# Response cache — exact (canonical) prompt match, bounded LRU
+# ---------------------------------------------------------------------------
+LLM_CACHE_SIZE = 1024
+_llm_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+
+def _prompt_key(prompt: str) -> bytes:
+    """Compact cache key for a prompt (avoids retaining the full prompt text)."""
+    return hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+
+
+def _cache_get(key: bytes) -> Optional[str]:
+    """Return a cached explanation for this key, refreshing its recency."""
+    text = _llm_cache.get(key)
+    if text is not None:
+        _llm_cache.move_to_end(key)
+    return text
+
+
+def _cache_put(key: bytes, text: str) -> None:
+    """Store an explanation, evicting the least recently used entry when full."""
+    _llm_cache[key] = text
+    _llm_cache.move_to_end(key)
+    if len(_llm_cache) > LLM_CACHE_SIZE:
+        _llm_cache.popitem(last=False)
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker — stop calling Gemini for a while after repeated failures
+# ---------------------------------------------------------------------------
+GEMINI_TIMEOUT_S = 4.0
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_S = 30.0
+
+_breaker_failures = 0
+_breaker_open_until = 0.0
+
+
+def _breaker_is_open() -> bool:
+    """True while the breaker is tripped and Gemini calls should be skipped."""
+    return time.monotonic() < _breaker_open_until
+
+
+def _record_gemini_failure() -> None:
+    """
+    Count a failed call; trip the breaker at BREAKER_FAIL_MAX.
+    After the reset window a single further failure re-trips it (half-open).
+    """
+    global _breaker_failures, _breaker_open_until
+    _breaker_failures += 1
+    if _breaker_failures >= BREAKER_FAIL_MAX:
+        _breaker_open_until = time.monotonic() + BREAKER_RESET_S
+        logger.warning(
+            f"Gemini failed {_breaker_failures} times in a row — "
+            f"using fallback explanations for {BREAKER_RESET_S:.0f}s."
+        )
+
+
+def _record_gemini_success() -> None:
+    """Close the breaker after a successful call."""
+    global _breaker_failures
+    _breaker_failures = 0
 
 
 # ---------------------------------------------------------------------------
 # LLM call
 # ---------------------------------------------------------------------------
-def _call_gemini(prompt: str) -> Optional[str]:
-    """Call Gemini and return the response text, or None on failure."""
-    if not _configure_gemini():
+# Prompts currently being answered; concurrent duplicates await the same future
+_inflight: Dict[bytes, "asyncio.Future[Optional[str]]"] = {}
+
+
+async def _call_gemini(prompt: str) -> Optional[str]:
+    """Call Gemini asynchronously and return the response text, or None on failure."""
+    cache_key = _prompt_key(prompt)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        logger.debug("Gemini explanation served from cache.")
+        return cached
+
+    pending = _inflight.get(cache_key)
+    if pending is not None:
+        logger.debug("Gemini explanation joined an in-flight request.")
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    text = None
+    try:
+        text = await _request_gemini(prompt, cache_key)
+    finally:
+        _inflight.pop(cache_key, None)
+        future.set_result(text)
+    return text
+
+
+async def _request_gemini(prompt: str, cache_key: bytes) -> Optional[str]:
+    """Issue one Gemini request for prompt and cache the answer under cache_key."""
+    if _breaker_is_open() or not _configure_gemini():
+        return None
+    semaphore = await _acquire_llm_slot()
+    if semaphore is None:
         return None
     try:
-        import google.generativeai as genai
-        # Using gemini-2.0-flash-lite-001 which may have better availability
-        model = genai.GenerativeModel("gemini-2.0-flash-lite-001")
-        response = model.generate_content(prompt)
+        response = await asyncio.wait_for(
+            _gemini_model.generate_content_async(prompt), timeout=GEMINI_TIMEOUT_S,
+        )
         text = response.text.strip()
+        _record_gemini_success()
+        if text:
+            _cache_put(cache_key, text)
         logger.info("Gemini explanation generated successfully.")
         return text
+    except asyncio.TimeoutError:
+        _record_gemini_failure()
+        logger.error(f"Gemini API call timed out after {GEMINI_TIMEOUT_S}s")
+        return None
     except Exception as e:
+        _record_gemini_failure()
         logger.error(f"Gemini API call failed: {e}")
         return None
+    finally:
+        semaphore.release()
+
+
+class GeminiStreamInterrupted(Exception):
+    """Raised by _stream_gemini when Gemini fails after text was already yielded."""
+
+
+# Queue markers between the upstream reader and the client-facing generator
+_STREAM_DONE = object()
+_STREAM_FAILED = object()
+
+
+async def _pump_gemini_stream(prompt: str, cache_key: bytes,
+                              queue: "asyncio.Queue[Any]") -> None:
+    """
+    Read one Gemini stream into `queue`, then put _STREAM_DONE or
+    _STREAM_FAILED. The concurrency slot is held only while reading from
+    Gemini, never while a slow client drains the queue.
+    """
+    chunks: List[str] = []
+    semaphore = await _acquire_llm_slot()
+    if semaphore is None:
+        queue.put_nowait(_STREAM_FAILED)
+        return
+    try:
+        # Opening the stream and each chunk get their own deadline, so a
+        # stream that stalls mid-way cannot pin the slot.
+        try:
+            response = await asyncio.wait_for(
+                _gemini_model.generate_content_async(prompt, stream=True),
+                timeout=GEMINI_TIMEOUT_S,
+            )
+            stream = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        stream.__anext__(), timeout=GEMINI_TIMEOUT_S,
+                    )
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    queue.put_nowait(chunk.text)
+        finally:
+            semaphore.release()
+    except asyncio.TimeoutError:
+        _record_gemini_failure()
+        logger.error(f"Gemini streaming call timed out after {GEMINI_TIMEOUT_S}s")
+        queue.put_nowait(_STREAM_FAILED)
+        return
+    except Exception as e:
+        _record_gemini_failure()
+        logger.error(f"Gemini streaming call failed: {e}")
+        queue.put_nowait(_STREAM_FAILED)
+        return
+
+    _record_gemini_success()
+
+    text = "".join(chunks).strip()
+    if text:
+        _cache_put(cache_key, text)
+    logger.info("Gemini explanation streamed successfully.")
+    queue.put_nowait(_STREAM_DONE)
+
+
+async def _stream_gemini(prompt: str) -> AsyncIterator[str]:
+    """
+    Stream Gemini response text chunk by chunk.
+    The concatenated text is cached once the stream completes. Yields nothing
+    if Gemini is unavailable or fails before producing output; raises
+    GeminiStreamInterrupted if it fails after some text was yielded.
+    """
+    cache_key = _prompt_key(prompt)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        logger.debug("Gemini explanation served from cache.")
+        yield cached
+        return
+
+    if _breaker_is_open() or not _configure_gemini():
+        return
+
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+    reader = asyncio.create_task(_pump_gemini_stream(prompt, cache_key, queue))
+    yielded = False
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                return
+            if item is _STREAM_FAILED:
+                if yielded:
+                    raise GeminiStreamInterrupted()
+                return
+            yielded = True
+            yield item
+    finally:
+        # Client went away (or we finished): stop reading from Gemini
+        reader.cancel()
 
 
 # ---------------------------------------------------------------------------
 # Fallback — structured template explanation
 # ---------------------------------------------------------------------------
-PHENOTYPE_DESC = {
+_PHENOTYPE_DESC_RAW = {
     "Poor Metabolizer":          "cannot efficiently metabolize this drug due to severely reduced enzyme activity",
     "Intermediate Metabolizer":  "has partially reduced enzyme activity, leading to slower drug metabolism than normal",
     "Normal Metabolizer":        "metabolizes this drug at a standard rate with no expected pharmacogenomic interaction",
@@ -100,7 +413,7 @@ PHENOTYPE_DESC = {
     "Indeterminate":             "has an uncertain metabolizer status based on the available genomic data",
 }
 
-SEVERITY_CONTEXT = {
+_SEVERITY_CONTEXT_RAW = {
     "none":     "No clinically significant pharmacogenomic interaction is expected.",
     "low":      "A minor pharmacogenomic interaction is noted; routine monitoring is advised.",
     "moderate": "A clinically significant interaction exists; dose adjustment is recommended.",
@@ -109,13 +422,38 @@ SEVERITY_CONTEXT = {
 }
 
 
+# Read-only, interned views so lookups compare by identity and the tables
+# cannot be mutated at runtime.
+PHENOTYPE_DESC = MappingProxyType({
+    sys.intern(k): sys.intern(v) for k, v in _PHENOTYPE_DESC_RAW.items()
+})
+SEVERITY_CONTEXT = MappingProxyType({
+    sys.intern(k): sys.intern(v) for k, v in _SEVERITY_CONTEXT_RAW.items()
+})
+
+# Static text resolved once at import; only the per-patient fields are
+# interpolated at call time.
+_ATYPICAL_DESC = "has an atypical metabolizer status"
+_PHENOTYPE_SENTENCE = MappingProxyType({
+    phenotype: f"The patient {desc} ({phenotype}). "
+    for phenotype, desc in PHENOTYPE_DESC.items()
+})
+_UNKNOWN_SEVERITY_CTX = SEVERITY_CONTEXT["unknown"]
+_CPIC_TRAILER = (
+    "This assessment follows CPIC (Clinical Pharmacogenomics Implementation Consortium) "
+    "guidelines and should be interpreted alongside the patient's full clinical context."
+)
+
+
 def _fallback_explanation(gene: str, diplotype: str, phenotype: str,
                            drug: str, risk_label: str,
                            variant_list: List[str],
                            severity: str, clinical_action: str) -> str:
     """Rule-based clinical explanation when LLM is unavailable."""
-    phenotype_desc = PHENOTYPE_DESC.get(phenotype, "has an atypical metabolizer status")
-    severity_ctx   = SEVERITY_CONTEXT.get(severity, SEVERITY_CONTEXT["unknown"])
+    phenotype_sentence = _PHENOTYPE_SENTENCE.get(phenotype)
+    if phenotype_sentence is None:
+        phenotype_sentence = f"The patient {_ATYPICAL_DESC} ({phenotype}). "
+    severity_ctx = SEVERITY_CONTEXT.get(severity, _UNKNOWN_SEVERITY_CTX)
 
     variant_text = (
         f"Detected variants ({', '.join(variant_list)}) mapped to diplotype {diplotype}."
@@ -125,22 +463,55 @@ def _fallback_explanation(gene: str, diplotype: str, phenotype: str,
 
     parts = [
         f"Pharmacogenomic analysis of {drug.capitalize()} based on {gene} genotyping:",
-        f"The patient {phenotype_desc} ({phenotype}). {variant_text}",
+        phenotype_sentence + variant_text,
         f"Risk classification: '{risk_label}'. {severity_ctx}",
     ]
     if clinical_action:
         parts.append(f"Clinical recommendation: {clinical_action}")
-    parts.append(
-        "This assessment follows CPIC (Clinical Pharmacogenomics Implementation Consortium) "
-        "guidelines and should be interpreted alongside the patient's full clinical context."
-    )
+    parts.append(_CPIC_TRAILER)
     return " ".join(parts)
 
 
+def _profile_fields(gene_profile: Optional[Dict]) -> Tuple[str, str, str, List[str]]:
+    """Extract (gene, diplotype, phenotype, rsIDs) from a gene profile dict."""
+    profile = gene_profile or {}
+    return (
+        profile.get("gene", "Unknown gene"),
+        profile.get("diplotype", "Unknown"),
+        profile.get("phenotype", "Indeterminate"),
+        profile.get("detected_rsids", []),
+    )
+
+
+# Cases whose explanation is fully determined by the template — no LLM needed
+_DIRECT_SEVERITIES = frozenset({"none"})
+_DIRECT_PHENOTYPES = frozenset({"Normal Metabolizer"})
+_DIRECT_RISK_LABELS = frozenset({"Unknown"})
+
+
+def _is_direct_case(severity: str, phenotype: str, risk_label: str) -> bool:
+    """True when the template answer is sufficient for this interaction."""
+    return (
+        severity in _DIRECT_SEVERITIES
+        or phenotype in _DIRECT_PHENOTYPES
+        or risk_label in _DIRECT_RISK_LABELS
+    )
+
+
+def _no_variant_explanation(drug: str) -> str:
+    """Explanation used when the VCF contained no pharmacogenomic variants."""
+    return (
+        f"No pharmacogenomic variants relevant to {drug.capitalize()} were detected "
+        "in the uploaded VCF file. In the absence of known risk variants, standard "
+        f"{drug.capitalize()} dosing is generally appropriate. Clinical judgment "
+        "should guide prescribing decisions."
+    )
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
-def generate_explanation(
+async def generate_explanation(
     variants: List[Dict],
     drug: str,
     risk: Dict[str, Any],
@@ -164,20 +535,23 @@ def generate_explanation(
     """
     risk_label = risk.get("label", "Unknown")
     severity   = risk.get("severity", "unknown")
-
-    # Extract gene profile fields
-    gene       = (gene_profile or {}).get("gene", "Unknown gene")
-    diplotype  = (gene_profile or {}).get("diplotype", "Unknown")
-    phenotype  = (gene_profile or {}).get("phenotype", "Indeterminate")
-    rsids      = (gene_profile or {}).get("detected_rsids", [])
+    gene, diplotype, phenotype, rsids = _profile_fields(gene_profile)
 
     # Handle no-variant case early
     if not variants:
-        return (
-            f"No pharmacogenomic variants relevant to {drug.capitalize()} were detected "
-            "in the uploaded VCF file. In the absence of known risk variants, standard "
-            f"{drug.capitalize()} dosing is generally appropriate. Clinical judgment "
-            "should guide prescribing decisions."
+        return _no_variant_explanation(drug)
+
+    # Deterministic cases are answered from the template directly
+    if _is_direct_case(severity, phenotype, risk_label):
+        return _fallback_explanation(
+            gene=gene,
+            diplotype=diplotype,
+            phenotype=phenotype,
+            drug=drug,
+            risk_label=risk_label,
+            variant_list=rsids,
+            severity=severity,
+            clinical_action=clinical_action,
         )
 
     # Build prompt and try LLM
@@ -190,7 +564,7 @@ def generate_explanation(
         variant_list=rsids,
     )
 
-    llm_response = _call_gemini(prompt)
+    llm_response = await _call_gemini(prompt)
     if llm_response:
         return llm_response
 
@@ -206,3 +580,118 @@ def generate_explanation(
         severity=severity,
         clinical_action=clinical_action,
     )
+
+
+# Separates a partial Gemini answer from the template that replaces it
+_STREAM_TRUNCATED_NOTICE = (
+    "\n\n[AI explanation interrupted — the generated text above is incomplete. "
+    "Standard clinical summary follows.]\n\n"
+)
+
+
+async def stream_explanation(
+    variants: List[Dict],
+    drug: str,
+    risk: Dict[str, Any],
+    gene_profile: Optional[Dict] = None,
+    clinical_action: str = "",
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of generate_explanation.
+
+    Yields Gemini output as it is generated; yields the template fallback
+    in a single chunk if the LLM is unavailable. If Gemini fails part-way,
+    a truncation notice and the template fallback follow the partial text.
+    Arguments are the same as generate_explanation.
+    """
+    risk_label = risk.get("label", "Unknown")
+    severity   = risk.get("severity", "unknown")
+    gene, diplotype, phenotype, rsids = _profile_fields(gene_profile)
+
+    if not variants:
+        yield _no_variant_explanation(drug)
+        return
+
+    streamed = False
+    if not _is_direct_case(severity, phenotype, risk_label):
+        prompt = _build_prompt(
+            gene=gene,
+            diplotype=diplotype,
+            phenotype=phenotype,
+            drug=drug,
+            risk_label=risk_label,
+            variant_list=rsids,
+        )
+        try:
+            async for chunk in _stream_gemini(prompt):
+                streamed = True
+                yield chunk
+        except GeminiStreamInterrupted:
+            logger.info("Gemini stream interrupted — appending fallback explanation.")
+            yield _STREAM_TRUNCATED_NOTICE
+            streamed = False
+    if streamed:
+        return
+
+    logger.info("Using template-based fallback explanation.")
+    yield _fallback_explanation(
+        gene=gene,
+        diplotype=diplotype,
+        phenotype=phenotype,
+        drug=drug,
+        risk_label=risk_label,
+        variant_list=rsids,
+        severity=severity,
+        clinical_action=clinical_action,
+    )
+
+
+def is_direct_response(
+    variants: List[Dict],
+    risk: Dict[str, Any],
+    gene_profile: Optional[Dict] = None,
+) -> bool:
+    """
+    Whether generate_explanation answers this case from the template
+    without calling the LLM (no variants, or a deterministic outcome).
+    """
+    if not variants:
+        return True
+    _, _, phenotype, _ = _profile_fields(gene_profile)
+    return _is_direct_case(
+        risk.get("severity", "unknown"),
+        phenotype,
+        risk.get("label", "Unknown"),
+    )
+
+
+async def generate_explanations_batch(items: List[Dict[str, Any]]) -> List[str]:
+    """
+    Generate explanations for several drug-gene interactions concurrently.
+
+    Args:
+        items : list of keyword-argument dicts accepted by generate_explanation
+
+    Returns:
+        Explanation strings in the same order as items.
+    """
+    return list(await asyncio.gather(
+        *(generate_explanation(**item) for item in items)
+    ))
+
+
+def generate_explanation_sync(
+    variants: List[Dict],
+    drug: str,
+    risk: Dict[str, Any],
+    gene_profile: Optional[Dict] = None,
+    clinical_action: str = "",
+) -> str:
+    """Blocking wrapper around generate_explanation for callers without an event loop."""
+    return asyncio.run(generate_explanation(
+        variants=variants,
+        drug=drug,
+        risk=risk,
+        gene_profile=gene_profile,
+        clinical_action=clinical_action,
+    ))
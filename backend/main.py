@@ -6,21 +6,25 @@ Accepts VCF uploads + drug name(s), returns structured pharmacogenomic risk JSON
 from fastapi import FastAPI, UploadFile, Form, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-import shutil
+from fastapi.responses import FileResponse, StreamingResponse
 import os
 import logging
+import aiofiles
 from dotenv import load_dotenv
 
 load_dotenv()  # Load environment variables from .env file
 
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from backend.vcf_parser import extract_variants
 from backend.risk_engine import predict_multi_drug, predict_risk, SUPPORTED_DRUGS
-from backend.explanation_engine import generate_explanation
+from backend.explanation_engine import (
+    generate_explanations_batch,
+    is_direct_response,
+    stream_explanation,
+)
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.environ.get("PHARMAGUARD_LOG", "WARNING").upper())
 logger = logging.getLogger("PharmaGuard.API")
 
 app = FastAPI(
@@ -47,6 +51,7 @@ app.add_middleware(
 TEMP_DIR = "/tmp/pharmaguard"
 os.makedirs(TEMP_DIR, exist_ok=True)
 MAX_FILE_SIZE_MB = 5
+UPLOAD_CHUNK_SIZE = 128 * 1024  # 128 KiB per read/write
 
 
 @app.get("/")
@@ -67,16 +72,22 @@ def home():
 # app.mount("/frontend", StaticFiles(directory="../frontend"), name="frontend")
 
 
-@app.post("/analyze")
+# A response model lets FastAPI serialise the report straight to JSON bytes
+# via Pydantic instead of going through jsonable_encoder.
+@app.post("/analyze", response_model=Dict[str, Any])
 async def analyze(
     file: UploadFile = File(...),
     drug: str = Form(...),
+    stream: bool = False,
 ):
-    """Single-drug analysis endpoint (backwards compatible)."""
-    return await _run_analysis(file, [drug])
+    """
+    Single-drug analysis endpoint (backwards compatible).
+    With ?stream=1 the LLM explanation is streamed back as plain text.
+    """
+    return await _run_analysis(file, [drug], stream=stream)
 
 
-@app.post("/analyze/multi")
+@app.post("/analyze/multi", response_model=Dict[str, Any])
 async def analyze_multi(
     file: UploadFile = File(...),
     drugs: str = Form(...),   # comma-separated list
@@ -88,7 +99,7 @@ async def analyze_multi(
     return await _run_analysis(file, drug_list)
 
 
-async def _run_analysis(file: UploadFile, drugs: List[str]):
+async def _run_analysis(file: UploadFile, drugs: List[str], stream: bool = False):
     """Shared analysis logic."""
     timestamp = datetime.now(timezone.utc).isoformat()
 
@@ -100,17 +111,24 @@ async def _run_analysis(file: UploadFile, drugs: List[str]):
         )
 
     file_location = os.path.join(TEMP_DIR, f"temp_{file.filename}")
-    content = await file.read()
-
-    if len(content) > MAX_FILE_SIZE_MB * 1024 * 1024:
+    max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
+    written = 0
+
+    # Stream the upload to disk in chunks so the event loop stays free
+    async with aiofiles.open(file_location, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_bytes:
+                break
+            await buffer.write(chunk)
+
+    if written > max_bytes:
+        os.remove(file_location)
         raise HTTPException(
             status_code=413,
             detail=f"File too large. Maximum size is {MAX_FILE_SIZE_MB} MB."
         )
 
-    with open(file_location, "wb") as buffer:
-        buffer.write(content)
-
     # ── Parse VCF ────────────────────────────────────────────────────────────
     parse_success = True
     parse_error = None
@@ -124,26 +142,46 @@ async def _run_analysis(file: UploadFile, drugs: List[str]):
         parse_error = str(e)
         logger.error(f"VCF parsing failed: {e}")
 
+    # Cleanup — variants are in memory from here on
+    try:
+        os.remove(file_location)
+    except Exception:
+        pass
+
     # ── Risk prediction ───────────────────────────────────────────────────────
     multi_result = predict_multi_drug(variants, drugs)
 
     # ── Explanation ───────────────────────────────────────────────────────────
-    explanations = {}
+    # One Gemini call per drug, issued concurrently
+    explanation_requests = []
     for drug_result in multi_result["drug_results"]:
-        drug_name = drug_result["drug"]
         gene_profile = multi_result["gene_profiles"].get(drug_result["gene_used"], {})
-        explanation = generate_explanation(
-            variants=variants,
-            drug=drug_name,
-            risk={
+        explanation_requests.append({
+            "variants": variants,
+            "drug": drug_result["drug"],
+            "risk": {
                 "label":    drug_result["risk_label"],
                 "severity": drug_result["severity"],
                 "confidence": drug_result["confidence_score"],
             },
-            gene_profile=gene_profile,
-            clinical_action=drug_result["clinical_action"],
+            "gene_profile": gene_profile,
+            "clinical_action": drug_result["clinical_action"],
+        })
+
+    if stream:
+        return StreamingResponse(
+            stream_explanation(**explanation_requests[0]),
+            media_type="text/plain",
         )
-        explanations[drug_name] = explanation
+
+    explanation_texts = await generate_explanations_batch(explanation_requests)
+    explanations = {
+        req["drug"]: text for req, text in zip(explanation_requests, explanation_texts)
+    }
+    direct_responses = {
+        req["drug"]: is_direct_response(req["variants"], req["risk"], req["gene_profile"])
+        for req in explanation_requests
+    }
 
     # ── Build structured response ─────────────────────────────────────────────
     drug_reports = []
@@ -179,7 +217,8 @@ async def _run_analysis(file: UploadFile, drugs: List[str]):
             },
 
             "llm_generated_explanation": {
-                "summary": explanations.get(drug_name, "")
+                "summary": explanations.get(drug_name, ""),
+                "direct_response": direct_responses.get(drug_name, False),
             },
 
             "quality_metrics": {
@@ -222,10 +261,4 @@ async def _run_analysis(file: UploadFile, drugs: List[str]):
         },
     }
 
-    # Cleanup
-    try:
-        os.remove(file_location)
-    except Exception:
-        pass
-
     return response
@@ -13,15 +13,24 @@ Supported Drugs : Codeine, Warfarin, Clopidogrel, Simvastatin,
                   Azathioprine, Fluorouracil
 """
 
+import os
+import sys
 import logging
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Any
+from array import array
+from collections import defaultdict
+from bisect import bisect_right
+from dataclasses import dataclass, fields, is_dataclass, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, Iterator, List, Dict, Optional, Any, Sequence, Tuple
 
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
+# Per-gene / per-drug messages are INFO; set PHARMAGUARD_LOG=INFO (or DEBUG)
+# to see them. The default keeps the hot path free of log formatting.
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("PHARMAGUARD_LOG", "WARNING").upper(),
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 logger = logging.getLogger("PharmaGuard.RiskEngine")
@@ -29,12 +38,12 @@ logger = logging.getLogger("PharmaGuard.RiskEngine")
 # ---------------------------------------------------------------------------
 # Constants — Phenotype codes
 # ---------------------------------------------------------------------------
-PM  = "Poor Metabolizer"
-IM  = "Intermediate Metabolizer"
-NM  = "Normal Metabolizer"
-RM  = "Rapid Metabolizer"
-URM = "Ultrarapid Metabolizer"
-INDETERMINATE = "Indeterminate"
+PM  = sys.intern("Poor Metabolizer")
+IM  = sys.intern("Intermediate Metabolizer")
+NM  = sys.intern("Normal Metabolizer")
+RM  = sys.intern("Rapid Metabolizer")
+URM = sys.intern("Ultrarapid Metabolizer")
+INDETERMINATE = sys.intern("Indeterminate")
 
 # Metabolizer activity scores (used for diplotype → phenotype mapping)
 ACTIVITY_SCORE = {
@@ -371,10 +380,127 @@ DRUG_RULES: Dict[str, Dict[str, Dict[str, Dict]]] = {
     },
 }
 
+# ---------------------------------------------------------------------------
+# Derived lookup tables — built once at import
+# ---------------------------------------------------------------------------
+
+def _intern_keys(table: Dict[str, Any]) -> None:
+    """Re-key a dict with interned strings, in place and order-preserving."""
+    for key in list(table):
+        table[sys.intern(key)] = table.pop(key)
+
+
+def _intern_rule_tables() -> None:
+    """
+    Intern every string in the rule tables, in place.
+    Duplicate labels/guidelines/actions collapse to one object and phenotype
+    comparisons against PM/NM/... become identity checks. Keys are interned
+    too, so lookups with parser-interned rsIDs/genes match on identity.
+    """
+    _intern_keys(RSID_DATABASE)
+    _intern_keys(GENE_PHENOTYPE_RULES)
+    _intern_keys(DRUG_RULES)
+    for gene_map in DRUG_RULES.values():
+        _intern_keys(gene_map)
+
+    for db in RSID_DATABASE.values():
+        for k, v in db.items():
+            if isinstance(v, str):
+                db[k] = sys.intern(v)
+
+    for gene, rules in GENE_PHENOTYPE_RULES.items():
+        GENE_PHENOTYPE_RULES[gene] = [(lo, hi, sys.intern(p)) for lo, hi, p in rules]
+
+    for gene_map in DRUG_RULES.values():
+        for gene, phenotype_map in gene_map.items():
+            gene_map[gene] = {
+                sys.intern(phenotype): {
+                    k: sys.intern(v) if isinstance(v, str) else v
+                    for k, v in rule.items()
+                }
+                for phenotype, rule in phenotype_map.items()
+            }
+
+
+_intern_rule_tables()
+
+
+def _share_identical_rules() -> None:
+    """
+    Replace every DRUG_RULES rule with a shared read-only view.
+    Rules with identical content (e.g. the SSRI and TCA blocks repeated
+    across drugs) collapse to a single MappingProxyType instance.
+    """
+    shared: Dict[Tuple, MappingProxyType] = {}
+    for gene_map in DRUG_RULES.values():
+        for phenotype_map in gene_map.values():
+            for phenotype, rule in phenotype_map.items():
+                key = tuple(sorted(rule.items()))
+                phenotype_map[phenotype] = shared.setdefault(key, MappingProxyType(rule))
+
+
+_share_identical_rules()
+
+# Per-gene upper bounds + phenotype names, built once for bisect lookup.
+# Rules are contiguous, so once sorted by lower bound the first rule whose
+# upper bound exceeds the score is the match: names[bisect_right(bounds, score)].
+def _build_pheno_bounds(rules: List[Tuple[float, float, str]]) -> Tuple[array, Tuple[str, ...]]:
+    ordered = sorted(rules, key=lambda rule: rule[0])
+    return array("d", [hi for _, hi, _ in ordered]), tuple(p for _, _, p in ordered)
+
+
+_PHENO_BOUNDS: Dict[str, Tuple[array, Tuple[str, ...]]] = {
+    gene: _build_pheno_bounds(rules)
+    for gene, rules in GENE_PHENOTYPE_RULES.items()
+}
+
+# Activity scores are sums of allele values in 0.5 steps, so the common case
+# is answered by direct index: _PHENO_HALF_STEPS[gene][int(score * 2)].
+_HALF_STEP_SLOTS = 21  # scores 0.0 .. 10.0
+
+
+def _bisect_phenotype(gene: str, activity_score: float) -> str:
+    """Bisect lookup over _PHENO_BOUNDS (gene must be present)."""
+    bounds, names = _PHENO_BOUNDS[gene]
+    idx = bisect_right(bounds, activity_score)
+    # Edge case: score at or beyond the max end
+    return names[idx] if idx < len(names) else names[-1]
+
+
+_PHENO_HALF_STEPS: Dict[str, Tuple[str, ...]] = {
+    gene: tuple(_bisect_phenotype(gene, i * 0.5) for i in range(_HALF_STEP_SLOTS))
+    for gene in _PHENO_BOUNDS
+}
+
+# Flat (drug, gene, phenotype) → rule view of DRUG_RULES: one lookup per
+# evaluation instead of three. Rules are the shared read-only views.
+DRUG_RULES_FLAT: Dict[Tuple[str, str, str], MappingProxyType] = {
+    (drug, gene, phenotype): rule
+    for drug, gene_map in DRUG_RULES.items()
+    for gene, phenotype_map in gene_map.items()
+    for phenotype, rule in phenotype_map.items()
+}
+
+# Static fields of the fallback used when a drug/gene/phenotype combination
+# has no CPIC rule; only the clinical action text depends on the inputs.
+_DEFAULT_RULE = MappingProxyType({
+    "label": "Safe",
+    "severity": "none",
+    "confidence_base": 0.70,
+    "cpic_guideline": "No specific CPIC guidance",
+})
+
+# Genes consulted for each drug, in priority order
+DRUG_TO_GENES: Dict[str, Tuple[str, ...]] = {
+    drug: tuple(gene_map) for drug, gene_map in DRUG_RULES.items()
+}
+
 # ---------------------------------------------------------------------------
 # Data classes for structured output
 # ---------------------------------------------------------------------------
-@dataclass
+# Annotations and gene results are memoised and shared between patients with
+# the same genotype, so they are frozen and hold tuples rather than lists.
+@dataclass(slots=True, frozen=True)
 class VariantAnnotation:
     rsid: str
     gene: str
@@ -385,21 +511,36 @@ class VariantAnnotation:
     chrom: str = ""
     pos: int = 0
     ref: str = ""
-    alt: List[str] = field(default_factory=list)
+    alt: Tuple[str, ...] = ()
+
+
+# One prebuilt annotation per known rsID; per-variant annotations are
+# cloned from these with only the VCF coordinates filled in.
+RSID_TEMPLATES: Dict[str, VariantAnnotation] = {
+    rsid: VariantAnnotation(
+        rsid=rsid,
+        gene=db["gene"],
+        star_allele=db["star"],
+        function=db["function"],
+        activity_score=db["activity"],
+        evidence_strength=db["evidence"],
+    )
+    for rsid, db in RSID_DATABASE.items()
+}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GeneResult:
     gene: str
-    detected_rsids: List[str]
-    annotated_variants: List[VariantAnnotation]
+    detected_rsids: Tuple[str, ...]
+    annotated_variants: Tuple[VariantAnnotation, ...]
     total_activity_score: float
     diplotype: str
     phenotype: str
     phenotype_reasoning: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DrugRiskResult:
     drug: str
     gene_used: str
@@ -409,7 +550,7 @@ class DrugRiskResult:
     confidence_score: float
     clinical_action: str
     cpic_guideline: str
-    supporting_variants: List[str]
+    supporting_variants: Tuple[str, ...]
     reasoning: str
     evidence_strength: str
 
@@ -418,6 +559,28 @@ class DrugRiskResult:
 # Utility functions
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def _shallow_asdict(obj: Any) -> Dict[str, Any]:
+    """
+    dataclasses.asdict() without the per-field deepcopy.
+    List and tuple fields become fresh lists (so the JSON shape is unchanged
+    and callers never share the cached results' sequences) and nested
+    dataclasses are converted; every other field is a str/number.
+    """
+    out = {}
+    for name in _field_names(type(obj)):
+        value = getattr(obj, name)
+        if isinstance(value, (list, tuple)):
+            value = [_shallow_asdict(v) if is_dataclass(v) else v for v in value]
+        out[name] = value
+    return out
+
+
+@lru_cache(maxsize=512)
 def _normalise_drug(drug: str) -> str:
     """Lowercase and strip the drug name for rule lookup."""
     return drug.strip().lower().replace("-", "").replace(" ", "")
@@ -435,35 +598,29 @@ def _annotate_variant(variant: Dict) -> Optional[VariantAnnotation]:
     rsid_list = rsid_raw if isinstance(rsid_raw, list) else [rsid_raw]
 
     for rsid in rsid_list:
-        if rsid and rsid in RSID_DATABASE:
-            db = RSID_DATABASE[rsid]
-            return VariantAnnotation(
-                rsid=rsid,
-                gene=db["gene"],
-                star_allele=db["star"],
-                function=db["function"],
-                activity_score=db["activity"],
-                evidence_strength=db["evidence"],
+        template = RSID_TEMPLATES.get(rsid) if rsid else None
+        if template is not None:
+            return replace(
+                template,
                 chrom=str(variant.get("chrom", "")),
                 pos=int(variant.get("pos", 0)),
                 ref=str(variant.get("ref", "")),
-                alt=[str(a) for a in variant.get("alt", [])],
+                alt=tuple(str(a) for a in variant.get("alt", [])),
             )
     return None
 
 
 def _classify_phenotype(gene: str, activity_score: float) -> str:
     """Map a gene's total activity score to its metabolizer phenotype."""
-    rules = GENE_PHENOTYPE_RULES.get(gene)
-    if rules is None:
+    table = _PHENO_HALF_STEPS.get(gene)
+    if table is None:
         return INDETERMINATE
 
-    for lo, hi, phenotype in rules:
-        if lo <= activity_score < hi:
-            return phenotype
-
-    # Edge case: score exactly at the max end
-    return rules[-1][2]
+    doubled = activity_score * 2.0
+    idx = int(doubled)
+    if idx == doubled and 0 <= idx < _HALF_STEP_SLOTS:
+        return table[idx]
+    return _bisect_phenotype(gene, activity_score)
 
 
 def _build_diplotype_label(annotated: List[VariantAnnotation], gene: str) -> str:
@@ -479,41 +636,99 @@ def _build_diplotype_label(annotated: List[VariantAnnotation], gene: str) -> str
     return f"{gene}:{stars[0]}/{stars[1]}"
 
 
-def _evidence_strength_factor(annotated: List[VariantAnnotation]) -> float:
+# Evidence levels ordered strongest first (lower rank wins), and the
+# confidence multiplier each level contributes
+_EV_RANK = {"high": 0, "moderate": 1, "low": 2}
+_EV_WEIGHTS = {"high": 1.0, "moderate": 0.85, "low": 0.65}
+_EV_MIN_WEIGHT = 0.65  # weakest weight, also used for unrecognised levels
+
+
+def _summarize_evidence(annotated: Sequence[VariantAnnotation]) -> Tuple[float, str, int]:
     """
-    Returns a multiplier [0.6, 1.0] based on the weakest evidence level
-    in the supporting variants, penalising low-evidence calls.
+    Single pass over the supporting variants.
+
+    Returns (evidence_factor, evidence_strength, n_variants): the factor is
+    a multiplier [0.6, 1.0] from the weakest evidence level, penalising
+    low-evidence calls; the strength is the strongest level present.
     """
     if not annotated:
-        return 0.6
-    weights = {"high": 1.0, "moderate": 0.85, "low": 0.65}
-    return min(weights.get(a.evidence_strength, 0.65) for a in annotated)
+        return 0.6, "inferred", 0
+    min_weight = 1.0
+    best_rank = 4
+    best_strength = "low"
+    for a in annotated:
+        strength = a.evidence_strength
+        weight = _EV_WEIGHTS.get(strength, _EV_MIN_WEIGHT)
+        if weight < min_weight:
+            min_weight = weight
+        rank = _EV_RANK.get(strength, 3)
+        if rank < best_rank:
+            best_rank = rank
+            best_strength = strength
+        if min_weight == _EV_MIN_WEIGHT and best_rank == 0:
+            break  # both extremes reached; later variants cannot change them
+    return min_weight, best_strength, len(annotated)
+
+
+# Reasoning text is assembled from fixed fragments and cached on its inputs,
+# so common profiles (e.g. *1/*1 Normal Metabolizer) are formatted only once.
+_PHENO_REASON_MID      = " activity score = "
+_PHENO_REASON_VARIANTS = ". Detected variants: "
+_PHENO_REASON_CLASS    = ". Phenotype classified as "
+_PHENO_REASON_SUFFIX   = " per CPIC activity-score model."
+_NO_ANNOTATED_VARIANTS = "no database-annotated variants"
+
+_RISK_REASON_BASED_ON  = " risk assessment based on "
+_RISK_REASON_PHENOTYPE = " phenotype ("
+_RISK_REASON_SCORE     = ", activity score "
+_RISK_REASON_CPIC      = "). CPIC classification: '"
+_RISK_REASON_SEVERITY  = "' (severity: "
+_RISK_REASON_SUFFIX    = ")."
 
 
 def _phenotype_reasoning(gene: str, phenotype: str, score: float,
                           annotated: List[VariantAnnotation]) -> str:
     """Generate a plain-English phenotype reasoning string."""
-    variant_list = ", ".join(
-        f"{a.rsid} ({a.star_allele}, {a.function})" for a in annotated
-    ) or "no database-annotated variants"
-    return (
-        f"{gene} activity score = {score:.2f}. "
-        f"Detected variants: {variant_list}. "
-        f"Phenotype classified as {phenotype} per CPIC activity-score model."
+    return _phenotype_reasoning_text(
+        gene, phenotype, score,
+        tuple((a.rsid, a.star_allele, a.function) for a in annotated),
     )
 
 
+@lru_cache(maxsize=4096)
+def _phenotype_reasoning_text(gene: str, phenotype: str, score: float,
+                              variants: Tuple[Tuple[str, str, str], ...]) -> str:
+    variant_list = ", ".join(
+        "".join((rsid, " (", star, ", ", function, ")"))
+        for rsid, star, function in variants
+    ) or _NO_ANNOTATED_VARIANTS
+    return "".join((
+        gene, _PHENO_REASON_MID, format(score, ".2f"),
+        _PHENO_REASON_VARIANTS, variant_list,
+        _PHENO_REASON_CLASS, phenotype, _PHENO_REASON_SUFFIX,
+    ))
+
+
 def _risk_reasoning(drug: str, gene: str, phenotype: str,
                     rule: Dict, score: float) -> str:
     """Generate a plain-English risk reasoning string."""
-    return (
-        f"{drug.capitalize()} risk assessment based on {gene} phenotype "
-        f"({phenotype}, activity score {score:.2f}). "
-        f"CPIC classification: '{rule['label']}' "
-        f"(severity: {rule['severity']})."
+    return _risk_reasoning_text(
+        drug, gene, phenotype, rule["label"], rule["severity"], score,
     )
 
 
+@lru_cache(maxsize=4096)
+def _risk_reasoning_text(drug: str, gene: str, phenotype: str,
+                         label: str, severity: str, score: float) -> str:
+    return "".join((
+        drug.capitalize(), _RISK_REASON_BASED_ON, gene,
+        _RISK_REASON_PHENOTYPE, phenotype,
+        _RISK_REASON_SCORE, format(score, ".2f"),
+        _RISK_REASON_CPIC, label,
+        _RISK_REASON_SEVERITY, severity, _RISK_REASON_SUFFIX,
+    ))
+
+
 def _compute_confidence(
     base: float,
     activity_score: float,
@@ -543,32 +758,128 @@ def _compute_confidence(
 # Core prediction functions
 # ---------------------------------------------------------------------------
 
+# Homozygous-alternate genotypes, phase separator normalised to "/"
+_HOM_ALT_GTS = frozenset({"1/1", "2/2", "3/3"})
+
+
+def _annotate_all(variants: List[Dict]) -> Dict[str, List[Tuple[Dict, VariantAnnotation]]]:
+    """
+    Annotate every variant against the rsID database in a single pass.
+    Returns (variant, annotation) pairs bucketed by gene; variants whose
+    rsID is unknown or belongs to a different gene are dropped.
+    """
+    buckets: Dict[str, List[Tuple[Dict, VariantAnnotation]]] = defaultdict(list)
+    for v in variants:
+        gene = v.get("gene")
+        ann = _annotate_variant(v)
+        if ann and ann.gene == gene:
+            buckets[gene].append((v, ann))
+        else:
+            rsid = v.get("rsid", "unknown")
+            logger.debug("  %s: rsID %r not in database — skipped", gene, rsid)
+    return buckets
+
+
+# Canonical genotype key: one (gene, chrom, pos, rsids, ref, alts, gt) entry
+# per target-gene variant, in VCF order (the first two matched alleles fill
+# the diplotype, so order is significant).
+GenotypeKey = Tuple[Tuple[Any, ...], ...]
+
+
+def patient_genotype_key(variants: List[Dict]) -> GenotypeKey:
+    """
+    Reduce extract_variants() output to the hashable key used by
+    analyse_all_genes() and evaluate_patient(). Variants outside
+    TARGET_GENES are dropped.
+    """
+    target_genes = set(TARGET_GENES)
+    key = []
+    for v in variants:
+        gene = v.get("gene")
+        if gene not in target_genes:
+            continue
+        rsid = v.get("rsid") or []
+        key.append((
+            gene,
+            v.get("chrom", ""),
+            v.get("pos", 0),
+            tuple(rsid) if isinstance(rsid, list) else (rsid,),
+            v.get("ref", ""),
+            tuple(v.get("alt", [])),
+            v.get("gt", "0/1"),
+        ))
+    return tuple(key)
+
+
+def _variants_from_key(genotype_key: GenotypeKey) -> List[Dict]:
+    """Rebuild the variant dicts analyse_gene() expects from a genotype key."""
+    return [
+        {"gene": gene, "chrom": chrom, "pos": pos, "rsid": list(rsids),
+         "ref": ref, "alt": list(alt), "gt": gt}
+        for gene, chrom, pos, rsids, ref, alt, gt in genotype_key
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _analyse_genotype(genotype_key: GenotypeKey,
+                      genes: Tuple[str, ...]) -> Dict[str, GeneResult]:
+    buckets = _annotate_all(_variants_from_key(genotype_key))
+    return {
+        gene: _analyse_gene_variants(gene, buckets.get(gene, []))
+        for gene in genes
+    }
+
+
+def _genes_for_drugs(drugs: Iterable[str]) -> Tuple[str, ...]:
+    """Target genes consulted by any of `drugs`, in TARGET_GENES order."""
+    needed = set()
+    for d in drugs:
+        needed.update(DRUG_TO_GENES.get(_normalise_drug(d), ()))
+    return tuple(gene for gene in TARGET_GENES if gene in needed)
+
+
+def analyse_all_genes(variants: List[Dict],
+                      genes: Optional[Iterable[str]] = None) -> Dict[str, GeneResult]:
+    """
+    Analyse every target gene (or only `genes`) for one patient in a single
+    bucketed pass.
+
+    Results are memoised on patient_genotype_key(variants), so repeated
+    calls with the same VCF content skip the per-gene analysis. The dict is
+    fresh per call; the GeneResult objects in it are shared but frozen.
+    """
+    genes = tuple(TARGET_GENES) if genes is None else tuple(genes)
+    return dict(_analyse_genotype(patient_genotype_key(variants), genes))
+
+
 def analyse_gene(gene: str, variants: List[Dict]) -> GeneResult:
     """
     Analyse all variants for a single gene.
     Handles zygosity (Het/Hom) and infers missing alleles as Reference (*1).
     """
-    logger.info(f"Analysing gene: {gene} with {len(variants)} candidate variants")
+    annotated = _annotate_all([v for v in variants if v.get("gene") == gene])
+    return _analyse_gene_variants(gene, annotated.get(gene, []))
+
+
+def _analyse_gene_variants(gene: str,
+                           annotated: List[Tuple[Dict, VariantAnnotation]]) -> GeneResult:
+    """analyse_gene() body for (variant, annotation) pairs already matched to `gene`."""
+    logger.info("Analysing gene: %s with %d annotated variants", gene, len(annotated))
 
-    gene_variants = [v for v in variants if v.get("gene") == gene]
     detected_alleles: List[VariantAnnotation] = []
 
-    for v in gene_variants:
-        ann = _annotate_variant(v)
-        if ann and ann.gene == gene:
-            # Parse Genotype
-            gt = v.get("gt", "0/1") # Default to Het if missing
-            is_hom = "1/1" in gt or "1|1" in gt or "2/2" in gt # Basic check
-            
-            # Add allele instances
-            detected_alleles.append(ann) # First allele
-            if is_hom:
-                detected_alleles.append(ann) # Second allele (same)
-            
-            logger.debug(f"  {gene}: matched {ann.rsid} ({gt}) -> {ann.star_allele} (x{2 if is_hom else 1})")
-        else:
-            rsid = v.get("rsid", "unknown")
-            logger.debug(f"  {gene}: rsID {rsid!r} not in database — skipped")
+    for v, ann in annotated:
+        # Parse Genotype
+        gt = v.get("gt", "0/1") # Default to Het if missing
+        is_hom = gt.replace("|", "/") in _HOM_ALT_GTS
+
+        # Add allele instances
+        detected_alleles.append(ann) # First allele
+        if is_hom:
+            detected_alleles.append(ann) # Second allele (same)
+
+        logger.debug("  %s: matched %s (%s) -> %s (x%d)",
+                     gene, ann.rsid, gt, ann.star_allele, 2 if is_hom else 1)
 
     # Calculate Activity Score
     # 1. Get default diplotype score (*1/*1)
@@ -633,12 +944,13 @@ def analyse_gene(gene: str, variants: List[Dict]) -> GeneResult:
     
     reasoning = _phenotype_reasoning(gene, phenotype, activity_score, annotated_variants_list)
 
-    logger.info(f"  {gene}: activity={activity_score:.2f}, phenotype={phenotype}, diplotype={diplotype}")
+    logger.info("  %s: activity=%.2f, phenotype=%s, diplotype=%s",
+                gene, activity_score, phenotype, diplotype)
 
     return GeneResult(
         gene=gene,
-        detected_rsids=[a.rsid for a in annotated_variants_list],
-        annotated_variants=annotated_variants_list,
+        detected_rsids=tuple(a.rsid for a in annotated_variants_list),
+        annotated_variants=tuple(annotated_variants_list),
         total_activity_score=activity_score,
         diplotype=diplotype,
         phenotype=phenotype,
@@ -654,11 +966,11 @@ def predict_drug_risk(drug_name: str, gene_results: Dict[str, GeneResult]) -> Dr
     clinical action.
     """
     drug_key = _normalise_drug(drug_name)
-    logger.info(f"Predicting risk for drug: {drug_name!r} (key={drug_key!r})")
+    logger.info("Predicting risk for drug: %r (key=%r)", drug_name, drug_key)
 
-    drug_rules = DRUG_RULES.get(drug_key)
-    if not drug_rules:
-        logger.warning(f"Drug '{drug_name}' not in rule database.")
+    drug_genes = DRUG_TO_GENES.get(drug_key)
+    if not drug_genes:
+        logger.warning("Drug '%s' not in rule database.", drug_name)
         return DrugRiskResult(
             drug=drug_name,
             gene_used="N/A",
@@ -671,51 +983,43 @@ def predict_drug_risk(drug_name: str, gene_results: Dict[str, GeneResult]) -> Dr
                 "Proceed per standard clinical guidelines."
             ),
             cpic_guideline="N/A",
-            supporting_variants=[],
+            supporting_variants=(),
             reasoning=f"Drug '{drug_name}' is not in the current CPIC rule set.",
             evidence_strength="none",
         )
 
     # Try each gene defined for this drug (priority order matters)
-    for gene, phenotype_rules in drug_rules.items():
+    for gene in drug_genes:
         gene_result = gene_results.get(gene)
         if gene_result is None:
-            logger.debug(f"  No gene result available for {gene} — skipping rule")
+            logger.debug("  No gene result available for %s — skipping rule", gene)
             continue
 
         phenotype = gene_result.phenotype
         if phenotype == INDETERMINATE:
-            logger.debug(f"  {gene} phenotype is Indeterminate — skipping")
+            logger.debug("  %s phenotype is Indeterminate — skipping", gene)
             continue
 
-        rule = phenotype_rules.get(phenotype)
+        rule = DRUG_RULES_FLAT.get((drug_key, gene, phenotype))
         if rule is None:
-            logger.debug(f"  No rule for {gene}/{phenotype} combo — defaulting to Safe")
+            logger.debug("  No rule for %s/%s combo — defaulting to Safe", gene, phenotype)
             rule = {
-                "label": "Safe",
-                "severity": "none",
-                "confidence_base": 0.70,
+                **_DEFAULT_RULE,
                 "clinical_action": (
                     f"No specific {drug_name} recommendation for {phenotype} "
                     f"{gene} phenotype. Use standard dosing with caution."
                 ),
-                "cpic_guideline": "No specific CPIC guidance",
             }
 
-        has_variants = len(gene_result.annotated_variants) > 0
-        ev_factor = _evidence_strength_factor(gene_result.annotated_variants)
+        ev_factor, ev_strength, n_variants = _summarize_evidence(
+            gene_result.annotated_variants
+        )
         confidence = _compute_confidence(
             base=rule["confidence_base"],
             activity_score=gene_result.total_activity_score,
-            n_variants=len(gene_result.annotated_variants),
+            n_variants=n_variants,
             evidence_factor=ev_factor,
-            has_variants=has_variants,
-        )
-
-        ev_strength = (
-            min((a.evidence_strength for a in gene_result.annotated_variants),
-                key=lambda x: {"high": 0, "moderate": 1, "low": 2}.get(x, 3))
-            if has_variants else "inferred"
+            has_variants=n_variants > 0,
         )
 
         reasoning = _risk_reasoning(
@@ -724,8 +1028,8 @@ def predict_drug_risk(drug_name: str, gene_results: Dict[str, GeneResult]) -> Dr
         )
 
         logger.info(
-            f"  {drug_name}: gene={gene}, phenotype={phenotype}, "
-            f"label={rule['label']}, confidence={confidence:.3f}"
+            "  %s: gene=%s, phenotype=%s, label=%s, confidence=%.3f",
+            drug_name, gene, phenotype, rule["label"], confidence,
         )
 
         return DrugRiskResult(
@@ -743,7 +1047,7 @@ def predict_drug_risk(drug_name: str, gene_results: Dict[str, GeneResult]) -> Dr
         )
 
     # Reached here: no applicable gene result found
-    logger.warning(f"No applicable gene/phenotype found for {drug_name}")
+    logger.warning("No applicable gene/phenotype found for %s", drug_name)
     return DrugRiskResult(
         drug=drug_name,
         gene_used="N/A",
@@ -756,7 +1060,7 @@ def predict_drug_risk(drug_name: str, gene_results: Dict[str, GeneResult]) -> Dr
             "No variants detected in relevant genes. Proceed with standard care."
         ),
         cpic_guideline="N/A",
-        supporting_variants=[],
+        supporting_variants=(),
         reasoning=(
             f"Relevant genes for {drug_name} were not detected in the VCF. "
             "Risk set to Unknown."
@@ -785,6 +1089,8 @@ SUPPORTED_DRUGS = [
     # DPYD
     "fluorouracil", "capecitabine",
 ]
+# Normalised keys for O(1) validation of user-supplied drug names
+_SUPPORTED_DRUG_KEYS = frozenset(_normalise_drug(d) for d in SUPPORTED_DRUGS)
 
 
 def predict_risk(variants: List[Dict], drug: str) -> Dict[str, Any]:
@@ -799,8 +1105,8 @@ def predict_risk(variants: List[Dict], drug: str) -> Dict[str, Any]:
         dict with keys: label, severity, confidence (+ full result nested)
     """
     drug_key = _normalise_drug(drug)
-    if drug_key not in SUPPORTED_DRUGS:
-        logger.warning(f"Drug '{drug}' not supported — returning Unknown")
+    if drug_key not in _SUPPORTED_DRUG_KEYS:
+        logger.warning("Drug '%s' not supported — returning Unknown", drug)
         return {
             "label": "Unknown",
             "severity": "unknown",
@@ -808,76 +1114,117 @@ def predict_risk(variants: List[Dict], drug: str) -> Dict[str, Any]:
             "full_result": None,
         }
 
-    gene_results = {
-        gene: analyse_gene(gene, variants) for gene in TARGET_GENES
-    }
+    # Only the drug's own genes feed its result; skip the others
+    gene_results = analyse_all_genes(variants, _genes_for_drugs([drug]))
     result = predict_drug_risk(drug, gene_results)
     return {
         "label": result.risk_label,
         "severity": result.severity,
         "confidence": result.confidence_score,
-        "full_result": asdict(result),
+        "full_result": _shallow_asdict(result),
     }
 
 
-def predict_multi_drug(variants: List[Dict], drugs: List[str]) -> Dict[str, Any]:
+def iter_drug_results(variants: List[Dict],
+                      drugs: List[str]) -> Iterator[Tuple[str, Any]]:
     """
-    Multi-drug prediction API.
+    Lazily produce multi-drug results as they are computed.
 
-    Args:
-        variants : list of variant dicts from vcf_parser.extract_variants()
-        drugs    : list of drug name strings
+    Yields, in order:
+      ("gene_profiles", {gene: GeneResult})   — once, before any drug
+      ("drug", DrugRiskResult)                — per supported drug
+      ("skipped", drug_name)                  — per unsupported drug
 
-    Returns:
-        dict with:
-          gene_profiles  — per-gene analysis (diplotype, phenotype, reasoning)
-          drug_results   — per-drug risk prediction
+    The gene-profile dict is fresh per call, but the GeneResult and
+    DrugRiskResult objects come from memoised analysis and are shared
+    with other patients; both are frozen, so use _shallow_asdict() (or
+    dataclasses.replace()) to get a copy that can be modified.
     """
     if not variants and not drugs:
-        logger.warning("predict_multi_drug called with empty variants and drugs")
+        logger.warning("Multi-drug prediction called with empty variants and drugs")
 
     # Validate inputs
     validated_drugs: List[str] = []
     skipped_drugs: List[str] = []
     for d in drugs:
         key = _normalise_drug(d)
-        if key in SUPPORTED_DRUGS:
+        if key in _SUPPORTED_DRUG_KEYS:
             validated_drugs.append(d)
         else:
-            logger.warning(f"Drug '{d}' is not supported — skipped")
+            logger.warning("Drug '%s' is not supported — skipped", d)
             skipped_drugs.append(d)
 
-    # Step 1: Analyse all genes once
-    gene_results: Dict[str, GeneResult] = {}
-    for gene in TARGET_GENES:
-        gene_results[gene] = analyse_gene(gene, variants)
+    # Step 1: Analyse all genes once (the gene profiles report every one)
+    gene_results = analyse_all_genes(variants)
+    yield "gene_profiles", gene_results
 
     # Step 2: Predict risk for each validated drug
-    drug_results: List[Dict] = []
     for drug in validated_drugs:
-        drug_risk = predict_drug_risk(drug, gene_results)
-        drug_results.append(asdict(drug_risk))
+        yield "drug", predict_drug_risk(drug, gene_results)
 
-    # Step 3: Add Unknown entries for unsupported drugs
+    # Step 3: Report unsupported drugs
     for drug in skipped_drugs:
-        drug_results.append({
-            "drug": drug,
-            "gene_used": "N/A",
-            "phenotype": INDETERMINATE,
-            "risk_label": "Unknown",
-            "severity": "unknown",
-            "confidence_score": 0.0,
-            "clinical_action": f"'{drug}' is not in the supported drug list.",
-            "cpic_guideline": "N/A",
-            "supporting_variants": [],
-            "reasoning": f"Drug '{drug}' is not supported by this version of PharmaGuard.",
-            "evidence_strength": "none",
-        })
+        yield "skipped", drug
+
+
+def predict_multi_drug(variants: List[Dict], drugs: List[str]) -> Dict[str, Any]:
+    """
+    Multi-drug prediction API.
+
+    Args:
+        variants : list of variant dicts from vcf_parser.extract_variants()
+        drugs    : list of drug name strings
+
+    Returns:
+        dict with:
+          gene_profiles  — per-gene analysis (diplotype, phenotype, reasoning)
+          drug_results   — per-drug risk prediction
+    """
+    gene_profiles: Dict[str, Dict] = {}
+    drug_results: List[Dict] = []
+    skipped_drugs: List[str] = []
+
+    for kind, item in iter_drug_results(variants, drugs):
+        if kind == "drug":
+            drug_results.append(_shallow_asdict(item))
+        elif kind == "skipped":
+            skipped_drugs.append(item)
+            # Unknown entry for the unsupported drug
+            drug_results.append({
+                "drug": item,
+                "gene_used": "N/A",
+                "phenotype": INDETERMINATE,
+                "risk_label": "Unknown",
+                "severity": "unknown",
+                "confidence_score": 0.0,
+                "clinical_action": f"'{item}' is not in the supported drug list.",
+                "cpic_guideline": "N/A",
+                "supporting_variants": [],
+                "reasoning": f"Drug '{item}' is not supported by this version of PharmaGuard.",
+                "evidence_strength": "none",
+            })
+        else:
+            gene_profiles = {
+                gene: _shallow_asdict(gr) for gene, gr in item.items()
+            }
 
     return {
-        "gene_profiles": {
-            gene: asdict(gr) for gene, gr in gene_results.items()
-        },
+        "gene_profiles": gene_profiles,
         "drug_results": drug_results,
         "skipped_drugs": skipped_drugs,
     }
+
+
+@lru_cache(maxsize=100_000)
+def evaluate_patient(genotype_key: GenotypeKey,
+                     drugs: Tuple[str, ...]) -> Tuple[DrugRiskResult, ...]:
+    """
+    Memoised cohort entry point: score every drug for one genotype.
+
+    Patients with identical PGx genotypes share a single evaluation, so
+    build the key once per patient with patient_genotype_key(). The
+    returned results are shared between callers, which is safe because
+    DrugRiskResult is frozen.
+    """
+    gene_results = _analyse_genotype(genotype_key, _genes_for_drugs(drugs))
+    return tuple(predict_drug_risk(drug, gene_results) for drug in drugs)
@@ -1,8 +1,75 @@
+import sys
+
 import vcfpy
 
+# cyvcf2 (htslib) is an optional, much faster reader; vcfpy stays the default.
+try:
+    import cyvcf2
+except ImportError:
+    cyvcf2 = None
+
 TARGET_GENES = ["CYP2D6", "CYP2C19", "CYP2C9", "SLCO1B1", "TPMT", "DPYD"]
+_TARGET_GENE_SET = frozenset(TARGET_GENES)
 
 def extract_variants(vcf_path):
+    if cyvcf2 is not None:
+        return _extract_variants_cyvcf2(vcf_path)
+    return _extract_variants_vcfpy(vcf_path)
+
+
+def _extract_variants_cyvcf2(vcf_path):
+    reader = cyvcf2.VCF(vcf_path)
+    if not reader.samples:
+        return []
+    # Only the first sample is used; let htslib skip decoding the others
+    reader.set_samples(reader.samples[:1])
+
+    variants = []
+
+    for record in reader:
+        # Same filter order as the vcfpy path: ID, then GENE, then genotype
+        if not record.ID:
+            continue
+
+        gene_info = record.INFO.get("GENE")
+        if not gene_info:
+            continue
+
+        gene = gene_info[0] if isinstance(gene_info, tuple) else gene_info
+        if gene not in _TARGET_GENE_SET:
+            continue
+
+        # gt_types is decoded in C: drop hom-ref and no-calls before
+        # building any Python objects for the genotype
+        gt_type = record.gt_types[0]
+        if gt_type == reader.HOM_REF or gt_type == reader.UNKNOWN:
+            continue
+
+        # genotypes[0] -> [allele, allele, ..., phased]; -1 marks a missing
+        # allele. Partial calls (e.g. ./1) are skipped, as vcfpy's call.called does.
+        *alleles, phased = record.genotypes[0]
+        if any(a < 0 for a in alleles):
+            continue
+
+        # Rebuild the GT string and apply the same alt-allele check as vcfpy
+        gt = ("|" if phased else "/").join(map(str, alleles))
+        if "1" not in gt and "2" not in gt:
+            continue
+
+        variants.append({
+            "gene": sys.intern(gene),
+            "chrom": record.CHROM,
+            "pos": record.POS,
+            "rsid": [sys.intern(rsid) for rsid in record.ID.split(";")],
+            "ref": record.REF,
+            "alt": list(record.ALT),
+            "gt": gt,
+        })
+
+    return variants
+
+
+def _extract_variants_vcfpy(vcf_path):
     reader = vcfpy.Reader.from_path(vcf_path)
 
     variants = []
@@ -11,7 +78,17 @@ def extract_variants(vcf_path):
         # basic filtering
         if not record.ID:
             continue
-            
+
+        # Cheap relevance check first: skip rows outside the PGx genes
+        # before looking at genotypes.
+        gene_info = record.INFO.get("GENE")
+        if not gene_info:
+            continue
+
+        gene = gene_info[0] if isinstance(gene_info, list) else gene_info
+        if gene not in _TARGET_GENE_SET:
+            continue
+
         # Check genotype for the first sample (assuming single-sample VCF)
         if not record.calls:
             continue
@@ -50,23 +127,15 @@ def extract_variants(vcf_path):
         if not has_alt:
              continue
 
-        # Get gene info from INFO field
-        gene_info = record.INFO.get("GENE")
-        if not gene_info:
-            continue
-            
-        gene = gene_info[0] if isinstance(gene_info, list) else gene_info
-
-        if gene in TARGET_GENES:
-            variant_info = {
-                "gene": gene,
-                "chrom": record.CHROM,
-                "pos": record.POS,
-                "rsid": record.ID,
-                "ref": record.REF,
-                "alt": [str(a) for a in record.ALT],
-                "gt": str(gt)
-            }
-            variants.append(variant_info)
+        variant_info = {
+            "gene": sys.intern(gene),
+            "chrom": record.CHROM,
+            "pos": record.POS,
+            "rsid": [sys.intern(rsid) for rsid in record.ID],
+            "ref": record.REF,
+            "alt": [str(a) for a in record.ALT],
+            "gt": str(gt)
+        }
+        variants.append(variant_info)
 
     return variants
\ No newline at end of file